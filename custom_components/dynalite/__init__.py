@@ -1,7 +1,7 @@
 """Support for the Dynalite networks."""
 
 import asyncio
-from typing import Any, Dict, Union
+from typing import Any, Dict
 
 import voluptuous as vol
 
@@ -12,174 +12,27 @@ from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers import config_validation as cv
 
-# Loading the config flow file will register the flow
-from .bridge import DynaliteBridge
 from .const import (
-    CONF_ACTIVE,
-    CONF_ACTIVE_INIT,
-    CONF_ACTIVE_OFF,
-    CONF_ACTIVE_ON,
-    CONF_AREA,
-    CONF_AUTO_DISCOVER,
     CONF_BRIDGES,
-    CONF_CHANNEL,
-    CONF_CHANNEL_COVER,
-    CONF_CHANNEL_TYPE,
-    CONF_CLOSE_PRESET,
-    CONF_DEFAULT,
-    CONF_DEVICE_CLASS,
-    CONF_DURATION,
-    CONF_FADE,
-    CONF_NAME,
-    CONF_NO_DEFAULT,
-    CONF_OPEN_PRESET,
-    CONF_POLL_TIMER,
-    CONF_PORT,
-    CONF_PRESET,
-    CONF_ROOM_OFF,
-    CONF_ROOM_ON,
-    CONF_STOP_PRESET,
-    CONF_TEMPLATE,
-    CONF_TILT_TIME,
-    CONF_TRIGGER,
-    DEFAULT_CHANNEL_TYPE,
-    DEFAULT_NAME,
-    DEFAULT_PORT,
-    DEFAULT_TEMPLATES,
+    CONF_HASH,
     DOMAIN,
     ENTITY_PLATFORMS,
     LOGGER,
-    CONF_AREA_CREATE,
-    CONF_AREA_CREATE_AUTO,
-    CONF_AREA_CREATE_ASSIGN,
-    CONF_AREA_CREATE_MANUAL,
-    CONF_AREA_OVERRIDE,
+    SERVICE_SET_LEVELS,
 )
 
 
-def num_string(value: Union[int, str]) -> str:
-    """Test if value is a string of digits, aka an integer."""
-    new_value = str(value)
-    if new_value.isdigit():
-        return new_value
-    raise vol.Invalid("Not a string with numbers")
+def validate_bridge(value: Any) -> Dict[str, Any]:
+    """Validate a bridge, the full schema is only built when a bridge is configured."""
+    from .schema import BRIDGE_SCHEMA
 
+    return BRIDGE_SCHEMA(value)
 
-CHANNEL_DATA_SCHEMA = vol.Schema(
-    {
-        vol.Optional(CONF_NAME): cv.string,
-        vol.Optional(CONF_FADE): vol.Coerce(float),
-        vol.Optional(CONF_CHANNEL_TYPE, default=DEFAULT_CHANNEL_TYPE): vol.Any(
-            "light", "switch"
-        ),
-    }
-)
-
-CHANNEL_SCHEMA = vol.Schema({num_string: CHANNEL_DATA_SCHEMA})
-
-PRESET_DATA_SCHEMA = vol.Schema(
-    {vol.Optional(CONF_NAME): cv.string, vol.Optional(CONF_FADE): vol.Coerce(float)}
-)
-
-PRESET_SCHEMA = vol.Schema({num_string: vol.Any(PRESET_DATA_SCHEMA, None)})
-
-TEMPLATE_ROOM_SCHEMA = vol.Schema(
-    {vol.Optional(CONF_ROOM_ON): num_string, vol.Optional(CONF_ROOM_OFF): num_string}
-)
-
-TEMPLATE_TRIGGER_SCHEMA = vol.Schema({vol.Optional(CONF_TRIGGER): num_string})
-
-TEMPLATE_TIMECOVER_SCHEMA = vol.Schema(
-    {
-        vol.Optional(CONF_CHANNEL_COVER): num_string,
-        vol.Optional(CONF_DEVICE_CLASS): cv.string,
-        vol.Optional(CONF_OPEN_PRESET): num_string,
-        vol.Optional(CONF_CLOSE_PRESET): num_string,
-        vol.Optional(CONF_STOP_PRESET): num_string,
-        vol.Optional(CONF_DURATION): vol.Coerce(float),
-        vol.Optional(CONF_TILT_TIME): vol.Coerce(float),
-    }
-)
-
-TEMPLATE_DATA_SCHEMA = vol.Any(
-    TEMPLATE_ROOM_SCHEMA, TEMPLATE_TRIGGER_SCHEMA, TEMPLATE_TIMECOVER_SCHEMA
-)
-
-TEMPLATE_SCHEMA = vol.Schema({str: TEMPLATE_DATA_SCHEMA})
-
-
-def validate_area(config: Dict[str, Any]) -> Dict[str, Any]:
-    """Validate that template parameters are only used if area is using the relevant template."""
-    conf_set = set()
-    for template in DEFAULT_TEMPLATES:
-        for conf in DEFAULT_TEMPLATES[template]:
-            conf_set.add(conf)
-    if config.get(CONF_TEMPLATE):
-        for conf in DEFAULT_TEMPLATES[config[CONF_TEMPLATE]]:
-            conf_set.remove(conf)
-    for conf in conf_set:
-        if config.get(conf):
-            raise vol.Invalid(
-                f"{conf} cannot should not be part of area {config[CONF_NAME]} config"
-            )
-    return config
-
-
-AREA_DATA_SCHEMA = vol.Schema(
-    vol.All(
-        {
-            vol.Required(CONF_NAME): cv.string,
-            vol.Optional(CONF_TEMPLATE): cv.string,
-            vol.Optional(CONF_FADE): vol.Coerce(float),
-            vol.Optional(CONF_AREA_OVERRIDE): cv.string,
-            vol.Optional(CONF_NO_DEFAULT): cv.boolean,
-            vol.Optional(CONF_CHANNEL): CHANNEL_SCHEMA,
-            vol.Optional(CONF_PRESET): PRESET_SCHEMA,
-            # the next ones can be part of the templates
-            vol.Optional(CONF_ROOM_ON): num_string,
-            vol.Optional(CONF_ROOM_OFF): num_string,
-            vol.Optional(CONF_TRIGGER): num_string,
-            vol.Optional(CONF_CHANNEL_COVER): num_string,
-            vol.Optional(CONF_DEVICE_CLASS): cv.string,
-            vol.Optional(CONF_OPEN_PRESET): num_string,
-            vol.Optional(CONF_CLOSE_PRESET): num_string,
-            vol.Optional(CONF_STOP_PRESET): num_string,
-            vol.Optional(CONF_DURATION): vol.Coerce(float),
-            vol.Optional(CONF_TILT_TIME): vol.Coerce(float),
-        },
-        validate_area,
-    )
-)
-
-AREA_SCHEMA = vol.Schema({num_string: vol.Any(AREA_DATA_SCHEMA, None)})
-
-PLATFORM_DEFAULTS_SCHEMA = vol.Schema({vol.Optional(CONF_FADE): vol.Coerce(float)})
-
-
-BRIDGE_SCHEMA = vol.Schema(
-    {
-        vol.Optional(CONF_NAME, default=DEFAULT_NAME): cv.string,
-        vol.Required(CONF_HOST): cv.string,
-        vol.Optional(CONF_PORT, default=DEFAULT_PORT): int,
-        vol.Optional(CONF_AUTO_DISCOVER, default=False): vol.Coerce(bool),
-        vol.Optional(CONF_POLL_TIMER, default=1.0): vol.Coerce(float),
-        vol.Optional(CONF_AREA): AREA_SCHEMA,
-        vol.Optional(CONF_DEFAULT): PLATFORM_DEFAULTS_SCHEMA,
-        vol.Optional(CONF_ACTIVE, default=False): vol.Any(
-            CONF_ACTIVE_ON, CONF_ACTIVE_OFF, CONF_ACTIVE_INIT, cv.boolean
-        ),
-        vol.Optional(CONF_PRESET): PRESET_SCHEMA,
-        vol.Optional(CONF_TEMPLATE): TEMPLATE_SCHEMA,
-        vol.Optional(CONF_AREA_CREATE, default=CONF_AREA_CREATE_MANUAL): vol.Any(
-            CONF_AREA_CREATE_MANUAL, CONF_AREA_CREATE_ASSIGN, CONF_AREA_CREATE_AUTO
-        ),
-    }
-)
 
 CONFIG_SCHEMA = vol.Schema(
     {
         DOMAIN: vol.Schema(
-            {vol.Optional(CONF_BRIDGES): vol.All(cv.ensure_list, [BRIDGE_SCHEMA])}
+            {vol.Optional(CONF_BRIDGES): vol.All(cv.ensure_list, [validate_bridge])}
         )
     },
     extra=vol.ALLOW_EXTRA,
@@ -222,13 +75,19 @@ async def async_entry_changed(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload entry since the data has changed."""
     LOGGER.debug("Reconfiguring entry %s", entry.data)
     bridge = hass.data[DOMAIN][entry.entry_id]
-    bridge.reload_config(entry.data)
+    await bridge.async_reload_config(entry.data)
     LOGGER.debug("Reconfiguring entry finished %s", entry.data)
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up a bridge from a config entry."""
     LOGGER.debug("Setting up entry %s", entry.data)
+    # Only load the library and the rest of the component once there is a bridge
+    from .bridge import DynaliteBridge
+    from .services import async_register_services
+
+    if not hass.services.has_service(DOMAIN, SERVICE_SET_LEVELS):
+        async_register_services(hass)
     bridge = DynaliteBridge(hass, entry.data)
     # need to do it before the listener
     hass.data[DOMAIN][entry.entry_id] = bridge
@@ -244,13 +103,39 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return True
 
 
+async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Move the areas, presets and templates of an old entry to their own storage."""
+    LOGGER.debug("Migrating entry from version %s", entry.version)
+    if entry.version == 1:
+        from .store import split_config, table_store
+
+        entry.version = 2
+        if CONF_HASH in entry.data:
+            # already split, the tables are in storage - must not overwrite them
+            hass.config_entries.async_update_entry(entry)
+            return True
+        entry_data, tables = split_config(dict(entry.data))
+        await table_store(hass, entry.data[CONF_HOST]).async_save(tables)
+        hass.config_entries.async_update_entry(entry, data=entry_data)
+    return True
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored tables together with the entry."""
+    from .store import table_store
+
+    await table_store(hass, entry.data[CONF_HOST]).async_remove()
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     LOGGER.debug("Unloading entry %s", entry.data)
-    hass.data[DOMAIN].pop(entry.entry_id)
+    bridge = hass.data[DOMAIN].pop(entry.entry_id)
     tasks = [
         hass.config_entries.async_forward_entry_unload(entry, platform)
         for platform in ENTITY_PLATFORMS
     ]
     results = await asyncio.gather(*tasks)
+    if bridge:
+        await bridge.async_reset()
     return False not in results
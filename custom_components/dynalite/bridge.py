@@ -1,14 +1,50 @@
 """Code to handle a Dynalite bridge."""
 
-from typing import TYPE_CHECKING, Any, Callable, Dict, List
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
 
+from dynalite_devices_lib.const import (
+    CONF_ACTION,
+    CONF_ACTION_CMD,
+    CONF_ACTION_REPORT,
+    CONF_TRGT_LEVEL,
+    EVENT_CHANNEL,
+    EVENT_PRESET,
+)
 from dynalite_devices_lib.dynalite_devices import DynaliteDevices
+from dynalite_devices_lib.event import DynetEvent
 
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import area_registry as ar, device_registry as dr
 from homeassistant.helpers.dispatcher import async_dispatcher_send
 
-from .const import CONF_ALL, CONF_HOST, ENTITY_PLATFORMS, LOGGER, CONF_AREA_CREATE, CONF_AREA_CREATE_MANUAL, CONF_AREA_CREATE_ASSIGN, CONF_AREA_CREATE_AUTO, DOMAIN
+from .connection import DynetConnection
+from .const import (
+    CONF_ALL,
+    CONF_AREA,
+    CONF_AREA_CREATE,
+    CONF_AREA_CREATE_ASSIGN,
+    CONF_AREA_CREATE_AUTO,
+    CONF_AREA_CREATE_MANUAL,
+    CONF_BATCH,
+    CONF_CHANNEL,
+    CONF_EVENTS,
+    CONF_FADE,
+    CONF_HOST,
+    CONF_LEVEL,
+    CONF_PRESET,
+    CONF_TEMPLATE,
+    CONF_TRIGGER,
+    CONF_WORKER,
+    DOMAIN,
+    ENTITY_PLATFORMS,
+    EVENT_DYNALITE,
+    EVENT_DYNALITE_BATCH,
+    EVENT_SOURCE_HA,
+    EVENT_SOURCE_NETWORK,
+    LOGGER,
+)
+from .store import async_load_config
+from .worker import DynetWorker
 
 if TYPE_CHECKING:  # pragma: no cover
     from .dynalitebase import DynaliteBase
@@ -27,25 +63,157 @@ class DynaliteBridge:
         self.device_reg = None
         self.host = config[CONF_HOST]
         self.areacreate = config[CONF_AREA_CREATE].lower()
-        # Configure the dynalite devices
+        self.config = config
+        self.events = None
+        self.event_batch = []
+        self.event_batch_timer = None
+        self.trigger_areas = set()
+        self.mute_updates = False
         self.dynalite_devices = DynaliteDevices(
             new_device_func=self.add_devices_when_registered,
             update_device_func=self.update_device,
         )
-        self.dynalite_devices.configure(config)
+        # read and decode the Dynet frames in a thread instead of the event loop if requested.
+        # This is only read here, so changing it needs a restart.
+        self.worker = bool(config.get(CONF_WORKER))
+        if self.worker:
+            # the worker collapses the device updates, so HA events get every frame separately
+            self.dynalite_devices._dynalite = DynetWorker(
+                broadcast_func=self.handle_dynet_event,
+                event_func=self.fire_dynet_event,
+            )
+        else:
+            self.dynalite_devices._dynalite = DynetConnection(
+                broadcast_func=self.handle_dynet_event
+            )
+
+    async def async_configure(self, config: Dict[str, Any]) -> None:
+        """Configure the devices, loading the areas from storage if needed."""
+        self.config = config
+        full_config = await async_load_config(self.hass, config)
+        # anything batched so far goes out with the old settings
+        self.fire_event_batch()
+        events = None
+        if CONF_EVENTS in full_config:
+            # an empty 'events:' turns them on for all areas
+            events = dict(full_config[CONF_EVENTS] or {})
+            if CONF_AREA in events:
+                events[CONF_AREA] = set(events[CONF_AREA])
+        # assigned in one go, the worker thread reads it
+        self.events = events
+        if self.worker:
+            self.dynalite_devices._dynalite.event_filter = (
+                None if events is None else self.wants_event
+            )
+        self.trigger_areas = {
+            int(area)
+            for area, area_config in full_config.get(CONF_AREA, {}).items()
+            if area_config and area_config.get(CONF_TEMPLATE) == CONF_TRIGGER
+        }
+        self.dynalite_devices.configure(full_config)
 
     async def async_setup(self) -> bool:
         """Set up a Dynalite bridge."""
-        # Configure the dynalite devices
         LOGGER.debug("Setting up bridge - host %s", self.host)
+        await self.async_configure(self.config)
         self.area_reg = await ar.async_get_registry(self.hass)
         self.device_reg = await dr.async_get_registry(self.hass)
         return await self.dynalite_devices.async_setup()
 
-    def reload_config(self, config: Dict[str, Any]) -> None:
+    async def async_reset(self) -> None:
+        """Disconnect from Dynet and stop the timers."""
+        LOGGER.debug("Resetting bridge - host %s", self.host)
+        self.fire_event_batch()
+        await self.dynalite_devices.async_reset()
+
+    async def async_reload_config(self, config: Dict[str, Any]) -> None:
         """Reconfigure a bridge when config changes."""
         LOGGER.debug("Reloading bridge - host %s, config %s", self.host, config)
-        self.dynalite_devices.configure(config)
+        await self.async_configure(config)
+
+    def event_area(self, event: DynetEvent) -> Optional[int]:
+        """Return the area of an event that should be fired in HA, or None."""
+        events = self.events
+        if events is None or event.event_type not in [
+            EVENT_PRESET,
+            EVENT_CHANNEL,
+        ]:
+            return None
+        if event.data.get(CONF_ACTION) == CONF_ACTION_REPORT:
+            # replies to polls are the current state, not something that happened
+            return None
+        area = event.data[CONF_AREA]
+        if area not in events.get(CONF_AREA, [area]):
+            return None
+        return area
+
+    def wants_event(self, event: DynetEvent) -> bool:
+        """Return whether an event should be fired in HA - called from the worker thread too."""
+        return self.event_area(event) is not None
+
+    @callback
+    def fire_dynet_event(self, event: DynetEvent) -> None:
+        """Fire a preset or channel event in HA if it is configured."""
+        area = self.event_area(event)
+        if area is None:
+            return
+        # commands sent from HA are echoed back as events too
+        local = getattr(event, "local", False)
+        level = None
+        if CONF_TRGT_LEVEL in event.data:
+            level = (255 - event.data[CONF_TRGT_LEVEL]) / 254
+        self.fire_event(
+            {
+                "host": self.host,
+                "source": EVENT_SOURCE_HA if local else EVENT_SOURCE_NETWORK,
+                CONF_AREA: area,
+                CONF_PRESET: event.data.get(CONF_PRESET),
+                CONF_CHANNEL: event.data.get(CONF_CHANNEL),
+                CONF_ACTION: event.data.get(CONF_ACTION, CONF_ACTION_CMD),
+                CONF_LEVEL: level,
+            }
+        )
+
+    @callback
+    def handle_dynet_event(self, event: DynetEvent) -> None:
+        """Pass the events on to the devices, firing them in HA unless the worker does."""
+        if not self.worker or getattr(event, "local", False):
+            self.fire_dynet_event(event)
+        # a trigger is momentary, the HA event is enough without writing its state
+        self.mute_updates = (
+            event.event_type == EVENT_PRESET
+            and self.event_area(event) in self.trigger_areas
+        )
+        try:
+            self.dynalite_devices.handle_event(event)
+        finally:
+            self.mute_updates = False
+
+    @callback
+    def fire_event(self, event_data: Dict[str, Any]) -> None:
+        """Fire an event in HA or add it to the batch."""
+        batch = self.events.get(CONF_BATCH, 0)
+        if not batch:
+            self.hass.bus.async_fire(EVENT_DYNALITE, event_data)
+            return
+        if not self.event_batch_timer:
+            self.event_batch_timer = self.hass.loop.call_later(
+                batch, self.fire_event_batch
+            )
+        self.event_batch.append(event_data)
+
+    @callback
+    def fire_event_batch(self) -> None:
+        """Fire all the batched events as a single event in HA."""
+        if self.event_batch_timer:
+            self.event_batch_timer.cancel()
+            self.event_batch_timer = None
+        events = self.event_batch
+        self.event_batch = []
+        if events:
+            self.hass.bus.async_fire(
+                EVENT_DYNALITE_BATCH, {"host": self.host, CONF_EVENTS: events}
+            )
 
     def update_signal(self, device: "DynaliteBase" = None) -> str:
         """Create signal to use to trigger entity update."""
@@ -65,7 +233,7 @@ class DynaliteBridge:
             )
             LOGGER.info("%s to dynalite host", log_string)
             async_dispatcher_send(self.hass, self.update_signal())
-        else:
+        elif not self.mute_updates:
             async_dispatcher_send(self.hass, self.update_signal(device))
 
     @callback
@@ -88,6 +256,55 @@ class DynaliteBridge:
                     self.waiting_devices[platform] = []
                 self.waiting_devices[platform].extend(platform_devices)
 
+    def set_levels(self, levels: List[Dict[str, Any]]) -> int:
+        """Set many channel levels at once and return the number of frames sent.
+
+        Requests are collapsed per channel (the last one wins) and sent ordered by area.
+        """
+        targets = {}
+        for item in levels:
+            targets[(item[CONF_AREA], item[CONF_CHANNEL])] = item
+        for area, channel in sorted(targets):
+            item = targets[(area, channel)]
+            fade = item.get(CONF_FADE)
+            if fade is None:
+                try:
+                    fade = self.dynalite_devices.get_channel_fade(area, channel)
+                except KeyError:
+                    fade = 0.0
+            # go straight to the connection, DynaliteDevices would override the fade
+            self.dynalite_devices._dynalite.set_channel_level(
+                area, channel, item[CONF_LEVEL], fade
+            )
+        return len(targets)
+
+    def recall_presets(self, presets: List[Dict[str, Any]]) -> int:
+        """Select presets in many areas at once and return the number of frames sent.
+
+        Only one preset can be active in an area, so only the last one per area is sent.
+        """
+        targets = {}
+        for item in presets:
+            targets[item[CONF_AREA]] = item
+        for area in sorted(targets):
+            item = targets[area]
+            preset = item[CONF_PRESET]
+            fade = item.get(CONF_FADE)
+            if fade is None:
+                try:
+                    fade = self.dynalite_devices.get_preset_fade(area, preset)
+                except KeyError:
+                    fade = 0.0
+            self.dynalite_devices.select_preset(area, preset, fade)
+        return len(targets)
+
+    @property
+    def send_time(self) -> float:
+        """Return how long it will take to send the frames that are still queued, in seconds."""
+        # the library paces the frames, one every message delay
+        connection = self.dynalite_devices._dynalite
+        return len(connection._out_buffer) * connection._message_delay
+
     @property
     def available(self):
         return self.dynalite_devices.connected
@@ -4,14 +4,13 @@ from typing import Any, Dict
 from homeassistant import config_entries
 from homeassistant.const import CONF_HOST
 
-from .bridge import DynaliteBridge
-from .const import DOMAIN, LOGGER
+from .const import CONF_HASH, DOMAIN, LOGGER
 
 
 class DynaliteFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a Dynalite config flow."""
 
-    VERSION = 1
+    VERSION = 2
     CONNECTION_CLASS = config_entries.CONN_CLASS_LOCAL_POLL
 
     def __init__(self) -> None:
@@ -21,16 +20,42 @@ class DynaliteFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
     async def async_step_import(self, import_info: Dict[str, Any]) -> Any:
         """Import a new bridge as a config entry."""
         LOGGER.debug("Starting async_step_import - %s", import_info)
+        # Only load the library when a bridge is imported
+        from .bridge import DynaliteBridge
+        from .store import split_config, table_store
+
         host = import_info[CONF_HOST]
+        # Areas, presets and templates are stored on their own, the entry only has a hash of them
+        entry_data, tables = split_config(import_info)
         for entry in self.hass.config_entries.async_entries(DOMAIN):
             if entry.data[CONF_HOST] == host:
-                if entry.data != import_info:
-                    self.hass.config_entries.async_update_entry(entry, data=import_info)
+                if entry.version < self.VERSION:
+                    # async_migrate_entry will split it, the YAML is imported on the next start
+                    return self.async_abort(reason="already_configured")
+                store = table_store(self.hass, host)
+                # loaded once here, the bridge then reuses them
+                tables_stale = (
+                    await store.async_load() is None
+                    or store.hash != entry_data[CONF_HASH]
+                )
+                if tables_stale:
+                    await store.async_save(tables)
+                if entry.data != entry_data:
+                    self.hass.config_entries.async_update_entry(entry, data=entry_data)
+                elif tables_stale:
+                    # the entry did not change so the bridge has to be told directly
+                    bridge = self.hass.data[DOMAIN].get(entry.entry_id)
+                    if bridge:
+                        await bridge.async_reload_config(entry.data)
                 return self.async_abort(reason="already_configured")
         # New entry
         bridge = DynaliteBridge(self.hass, import_info)
-        if not await bridge.async_setup():
+        connected = await bridge.async_setup()
+        # only a connection test, the entry sets up its own bridge
+        await bridge.async_reset()
+        if not connected:
             LOGGER.error("Unable to setup bridge - import info=%s", import_info)
             return self.async_abort(reason="no_connection")
-        LOGGER.debug("Creating entry for the bridge - %s", import_info)
-        return self.async_create_entry(title=host, data=import_info)
+        await table_store(self.hass, host).async_save(tables)
+        LOGGER.debug("Creating entry for the bridge - %s", entry_data)
+        return self.async_create_entry(title=host, data=entry_data)
@@ -0,0 +1,70 @@
+"""Connection to the Dynet network for a Dynalite bridge."""
+
+from typing import Callable, Optional
+
+from dynalite_devices_lib.const import (
+    CONF_ACTION,
+    CONF_ACTION_CMD,
+    CONF_ACTION_REPORT,
+    EVENT_PRESET,
+)
+from dynalite_devices_lib.dynalite import Dynalite
+from dynalite_devices_lib.dynet import DynetPacket
+from dynalite_devices_lib.event import DynetEvent
+from dynalite_devices_lib.opcodes import OpcodeType
+
+
+class DynetConnection(Dynalite):
+    """Dynalite connection that can be shut down while the network is quiet.
+
+    Events that echo commands sent from Home Assistant get a true 'local' attribute,
+    and preset events get an action like channel events, 'report' for poll replies.
+    """
+
+    def __init__(self, broadcast_func: Callable[[DynetEvent], None]) -> None:
+        """Initialize the connection."""
+        super().__init__(broadcast_func=broadcast_func)
+        self._local = False
+
+    @staticmethod
+    def event_from_packet(packet: DynetPacket) -> Optional[DynetEvent]:
+        """Create an event from a valid packet."""
+        event = Dynalite.event_from_packet(packet)
+        if event and event.event_type == EVENT_PRESET:
+            # a report answers a request (e.g. active polling), nothing was selected
+            if packet.command == OpcodeType.REPORT_PRESET.value:
+                event.data[CONF_ACTION] = CONF_ACTION_REPORT
+            else:
+                event.data[CONF_ACTION] = CONF_ACTION_CMD
+        return event
+
+    def broadcast(self, event: DynetEvent) -> None:
+        """Broadcast an event, marking the ones that come from our own commands."""
+        event.local = self._local
+        super().broadcast(event)
+
+    def set_channel_level(
+        self, area: int, channel: int, level: float, fade: float
+    ) -> None:
+        """Set the level of a channel."""
+        self._local = True
+        try:
+            super().set_channel_level(area, channel, level, fade)
+        finally:
+            self._local = False
+
+    def select_preset(self, area: int, preset: int, fade: float) -> None:
+        """Select a preset in an area."""
+        self._local = True
+        try:
+            super().select_preset(area, preset, fade)
+        finally:
+            self._local = False
+
+    async def async_reset(self) -> None:
+        """Close the socket so the reader loop stops, and wait for it."""
+        self._resetting = True
+        # the reader only checks for a reset after a read returns, so end the stream
+        if self._writer:
+            self._writer.close()
+        await super().async_reset()
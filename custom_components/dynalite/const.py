@@ -6,6 +6,9 @@ DOMAIN = "dynalite"
 
 ENTITY_PLATFORMS = ["light", "switch", "cover"]
 
+STORAGE_VERSION = 1
+DATA_TABLE_STORES = "dynalite_table_stores"
+
 
 CONF_ACTIVE = "active"
 CONF_ACTIVE_INIT = "init"
@@ -19,6 +22,7 @@ CONF_AREA_CREATE_ASSIGN = "assign"
 CONF_AREA_CREATE_AUTO = "auto"
 CONF_AREA_OVERRIDE = "areaoverride"
 CONF_AUTO_DISCOVER = "autodiscover"
+CONF_BATCH = "batch"
 CONF_BRIDGES = "bridges"
 CONF_CHANNEL = "channel"
 CONF_CHANNEL_COVER = "channelcover"
@@ -27,14 +31,19 @@ CONF_CLOSE_PRESET = "close"
 CONF_DEFAULT = "default"
 CONF_DEVICE_CLASS = "class"
 CONF_DURATION = "duration"
+CONF_EVENTS = "events"
 CONF_FADE = "fade"
+CONF_HASH = "hash"
 CONF_HOST = "host"
+CONF_LEVEL = "level"
+CONF_LEVELS = "levels"
 CONF_NAME = "name"
 CONF_NO_DEFAULT = "nodefault"
 CONF_OPEN_PRESET = "open"
 CONF_POLL_TIMER = "polltimer"
 CONF_PORT = "port"
 CONF_PRESET = "preset"
+CONF_PRESETS = "presets"
 CONF_ROOM = "room"
 CONF_ROOM_OFF = "room_off"
 CONF_ROOM_ON = "room_on"
@@ -43,11 +52,22 @@ CONF_TEMPLATE = "template"
 CONF_TILT_TIME = "tilt"
 CONF_TIME_COVER = "timecover"
 CONF_TRIGGER = "trigger"
+CONF_WORKER = "worker"
+
+SERVICE_SET_LEVELS = "set_levels"
+SERVICE_RECALL_PRESETS = "recall_presets"
+
+EVENT_BULK_COMPLETE = "dynalite_bulk_complete"
+EVENT_DYNALITE = "dynalite_event"
+EVENT_DYNALITE_BATCH = "dynalite_events"
+EVENT_SOURCE_HA = "homeassistant"
+EVENT_SOURCE_NETWORK = "network"
 
 DEFAULT_CHANNEL_TYPE = "light"
 DEFAULT_COVER_CLASS = "shutter"
 DEFAULT_NAME = "dynalite"
 DEFAULT_PORT = 12345
+DEFAULT_WORKER_BATCH = 0.05  # seconds between batches handed to the loop
 DEFAULT_TEMPLATES = {
     CONF_ROOM: [CONF_ROOM_ON, CONF_ROOM_OFF],
     CONF_TRIGGER: [CONF_TRIGGER],
@@ -1,7 +1,6 @@
 """Support for the Dynalite devices as entities."""
-from typing import Any, Callable, Dict
+from typing import TYPE_CHECKING, Any, Callable, Dict
 
-from .bridge import DynaliteBridge
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
@@ -9,6 +8,9 @@ from homeassistant.helpers.entity import Entity
 
 from .const import DOMAIN, LOGGER
 
+if TYPE_CHECKING:  # pragma: no cover
+    from .bridge import DynaliteBridge
+
 
 def async_setup_entry_base(
     hass: HomeAssistant,
@@ -36,7 +38,7 @@ def async_setup_entry_base(
 class DynaliteBase(Entity):
     """Base class for the Dynalite entities."""
 
-    def __init__(self, device: Any, bridge: DynaliteBridge) -> None:
+    def __init__(self, device: Any, bridge: "DynaliteBridge") -> None:
         """Initialize the base class."""
         self._device = device
         self._bridge = bridge
@@ -0,0 +1,218 @@
+"""Configuration and service schemas for the Dynalite component."""
+
+from typing import Any, Dict, Union
+
+import voluptuous as vol
+
+from homeassistant.const import CONF_HOST
+from homeassistant.helpers import config_validation as cv
+
+from .const import (
+    CONF_ACTIVE,
+    CONF_ACTIVE_INIT,
+    CONF_ACTIVE_OFF,
+    CONF_ACTIVE_ON,
+    CONF_AREA,
+    CONF_AUTO_DISCOVER,
+    CONF_BATCH,
+    CONF_CHANNEL,
+    CONF_CHANNEL_COVER,
+    CONF_CHANNEL_TYPE,
+    CONF_CLOSE_PRESET,
+    CONF_DEFAULT,
+    CONF_DEVICE_CLASS,
+    CONF_DURATION,
+    CONF_EVENTS,
+    CONF_FADE,
+    CONF_LEVEL,
+    CONF_LEVELS,
+    CONF_NAME,
+    CONF_NO_DEFAULT,
+    CONF_OPEN_PRESET,
+    CONF_POLL_TIMER,
+    CONF_PORT,
+    CONF_PRESET,
+    CONF_PRESETS,
+    CONF_ROOM_OFF,
+    CONF_ROOM_ON,
+    CONF_STOP_PRESET,
+    CONF_TEMPLATE,
+    CONF_TILT_TIME,
+    CONF_TRIGGER,
+    CONF_WORKER,
+    DEFAULT_CHANNEL_TYPE,
+    DEFAULT_NAME,
+    DEFAULT_PORT,
+    DEFAULT_TEMPLATES,
+    CONF_AREA_CREATE,
+    CONF_AREA_CREATE_AUTO,
+    CONF_AREA_CREATE_ASSIGN,
+    CONF_AREA_CREATE_MANUAL,
+    CONF_AREA_OVERRIDE,
+)
+
+
+def num_string(value: Union[int, str]) -> str:
+    """Test if value is a string of digits, aka an integer."""
+    new_value = str(value)
+    if new_value.isdigit():
+        return new_value
+    raise vol.Invalid("Not a string with numbers")
+
+
+CHANNEL_DATA_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_NAME): cv.string,
+        vol.Optional(CONF_FADE): vol.Coerce(float),
+        vol.Optional(CONF_CHANNEL_TYPE, default=DEFAULT_CHANNEL_TYPE): vol.Any(
+            "light", "switch"
+        ),
+    }
+)
+
+CHANNEL_SCHEMA = vol.Schema({num_string: CHANNEL_DATA_SCHEMA})
+
+PRESET_DATA_SCHEMA = vol.Schema(
+    {vol.Optional(CONF_NAME): cv.string, vol.Optional(CONF_FADE): vol.Coerce(float)}
+)
+
+PRESET_SCHEMA = vol.Schema({num_string: vol.Any(PRESET_DATA_SCHEMA, None)})
+
+TEMPLATE_ROOM_SCHEMA = vol.Schema(
+    {vol.Optional(CONF_ROOM_ON): num_string, vol.Optional(CONF_ROOM_OFF): num_string}
+)
+
+TEMPLATE_TRIGGER_SCHEMA = vol.Schema({vol.Optional(CONF_TRIGGER): num_string})
+
+TEMPLATE_TIMECOVER_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_CHANNEL_COVER): num_string,
+        vol.Optional(CONF_DEVICE_CLASS): cv.string,
+        vol.Optional(CONF_OPEN_PRESET): num_string,
+        vol.Optional(CONF_CLOSE_PRESET): num_string,
+        vol.Optional(CONF_STOP_PRESET): num_string,
+        vol.Optional(CONF_DURATION): vol.Coerce(float),
+        vol.Optional(CONF_TILT_TIME): vol.Coerce(float),
+    }
+)
+
+TEMPLATE_DATA_SCHEMA = vol.Any(
+    TEMPLATE_ROOM_SCHEMA, TEMPLATE_TRIGGER_SCHEMA, TEMPLATE_TIMECOVER_SCHEMA
+)
+
+TEMPLATE_SCHEMA = vol.Schema({str: TEMPLATE_DATA_SCHEMA})
+
+
+def validate_area(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate that template parameters are only used if area is using the relevant template."""
+    conf_set = set()
+    for template in DEFAULT_TEMPLATES:
+        for conf in DEFAULT_TEMPLATES[template]:
+            conf_set.add(conf)
+    if config.get(CONF_TEMPLATE):
+        for conf in DEFAULT_TEMPLATES[config[CONF_TEMPLATE]]:
+            conf_set.remove(conf)
+    for conf in conf_set:
+        if config.get(conf):
+            raise vol.Invalid(
+                f"{conf} cannot should not be part of area {config[CONF_NAME]} config"
+            )
+    return config
+
+
+AREA_DATA_SCHEMA = vol.Schema(
+    vol.All(
+        {
+            vol.Required(CONF_NAME): cv.string,
+            vol.Optional(CONF_TEMPLATE): cv.string,
+            vol.Optional(CONF_FADE): vol.Coerce(float),
+            vol.Optional(CONF_AREA_OVERRIDE): cv.string,
+            vol.Optional(CONF_NO_DEFAULT): cv.boolean,
+            vol.Optional(CONF_CHANNEL): CHANNEL_SCHEMA,
+            vol.Optional(CONF_PRESET): PRESET_SCHEMA,
+            # the next ones can be part of the templates
+            vol.Optional(CONF_ROOM_ON): num_string,
+            vol.Optional(CONF_ROOM_OFF): num_string,
+            vol.Optional(CONF_TRIGGER): num_string,
+            vol.Optional(CONF_CHANNEL_COVER): num_string,
+            vol.Optional(CONF_DEVICE_CLASS): cv.string,
+            vol.Optional(CONF_OPEN_PRESET): num_string,
+            vol.Optional(CONF_CLOSE_PRESET): num_string,
+            vol.Optional(CONF_STOP_PRESET): num_string,
+            vol.Optional(CONF_DURATION): vol.Coerce(float),
+            vol.Optional(CONF_TILT_TIME): vol.Coerce(float),
+        },
+        validate_area,
+    )
+)
+
+AREA_SCHEMA = vol.Schema({num_string: vol.Any(AREA_DATA_SCHEMA, None)})
+
+PLATFORM_DEFAULTS_SCHEMA = vol.Schema({vol.Optional(CONF_FADE): vol.Coerce(float)})
+
+DYNET_NUMBER = vol.All(vol.Coerce(int), vol.Range(min=1, max=255))
+
+SECONDS = vol.All(vol.Coerce(float), vol.Range(min=0))
+
+EVENTS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_AREA): vol.All(cv.ensure_list, [DYNET_NUMBER]),
+        vol.Optional(CONF_BATCH, default=0): SECONDS,
+    }
+)
+
+
+BRIDGE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_NAME, default=DEFAULT_NAME): cv.string,
+        vol.Required(CONF_HOST): cv.string,
+        vol.Optional(CONF_PORT, default=DEFAULT_PORT): int,
+        vol.Optional(CONF_AUTO_DISCOVER, default=False): vol.Coerce(bool),
+        vol.Optional(CONF_POLL_TIMER, default=1.0): vol.Coerce(float),
+        vol.Optional(CONF_AREA): AREA_SCHEMA,
+        vol.Optional(CONF_DEFAULT): PLATFORM_DEFAULTS_SCHEMA,
+        vol.Optional(CONF_ACTIVE, default=False): vol.Any(
+            CONF_ACTIVE_ON, CONF_ACTIVE_OFF, CONF_ACTIVE_INIT, cv.boolean
+        ),
+        vol.Optional(CONF_PRESET): PRESET_SCHEMA,
+        vol.Optional(CONF_TEMPLATE): TEMPLATE_SCHEMA,
+        vol.Optional(CONF_AREA_CREATE, default=CONF_AREA_CREATE_MANUAL): vol.Any(
+            CONF_AREA_CREATE_MANUAL, CONF_AREA_CREATE_ASSIGN, CONF_AREA_CREATE_AUTO
+        ),
+        vol.Optional(CONF_WORKER, default=False): cv.boolean,
+        vol.Optional(CONF_EVENTS): vol.Any(EVENTS_SCHEMA, None),
+    }
+)
+
+LEVEL_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_HOST): cv.string,
+        vol.Required(CONF_AREA): DYNET_NUMBER,
+        vol.Required(CONF_CHANNEL): DYNET_NUMBER,
+        vol.Required(CONF_LEVEL): vol.All(vol.Coerce(float), vol.Range(min=0, max=1)),
+        vol.Optional(CONF_FADE): SECONDS,
+    }
+)
+
+PRESET_RECALL_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_HOST): cv.string,
+        vol.Required(CONF_AREA): DYNET_NUMBER,
+        vol.Required(CONF_PRESET): DYNET_NUMBER,
+        vol.Optional(CONF_FADE): SECONDS,
+    }
+)
+
+SET_LEVELS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_HOST): cv.string,
+        vol.Required(CONF_LEVELS): vol.All(cv.ensure_list, [LEVEL_SCHEMA]),
+    }
+)
+
+RECALL_PRESETS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_HOST): cv.string,
+        vol.Required(CONF_PRESETS): vol.All(cv.ensure_list, [PRESET_RECALL_SCHEMA]),
+    }
+)
@@ -0,0 +1,92 @@
+"""Bulk services for the Dynalite component."""
+
+import time
+
+from homeassistant.core import HomeAssistant, ServiceCall
+
+from .const import (
+    CONF_HOST,
+    CONF_LEVELS,
+    CONF_PRESETS,
+    DOMAIN,
+    EVENT_BULK_COMPLETE,
+    LOGGER,
+    SERVICE_RECALL_PRESETS,
+    SERVICE_SET_LEVELS,
+)
+from .schema import RECALL_PRESETS_SCHEMA, SET_LEVELS_SCHEMA
+
+
+def async_register_services(hass: HomeAssistant) -> None:
+    """Register the bulk services."""
+
+    async def async_bulk_service(service_call: ServiceCall) -> None:
+        """Send a list of levels or presets to the bridges in one go."""
+        start = time.perf_counter()
+        if service_call.service == SERVICE_SET_LEVELS:
+            items = service_call.data[CONF_LEVELS]
+        else:
+            assert service_call.service == SERVICE_RECALL_PRESETS
+            items = service_call.data[CONF_PRESETS]
+        bridges = {
+            bridge.host: bridge for bridge in hass.data[DOMAIN].values() if bridge
+        }
+        default_host = service_call.data.get(CONF_HOST)
+        if default_host is None and len(bridges) == 1:
+            default_host = next(iter(bridges))
+        # areas and channels belong to a single Dynet network, so group by bridge
+        host_items = {}
+        for item in items:
+            host = item.get(CONF_HOST, default_host)
+            if host is None:
+                LOGGER.error(
+                    "%s: host is required when there is more than one bridge",
+                    service_call.service,
+                )
+                return
+            if host not in bridges:
+                LOGGER.error(
+                    "%s: no dynalite bridge for host %s", service_call.service, host
+                )
+                return
+            host_items.setdefault(host, []).append(item)
+        frames = 0
+        for host, cur_items in host_items.items():
+            if service_call.service == SERVICE_SET_LEVELS:
+                frames += bridges[host].set_levels(cur_items)
+            else:
+                frames += bridges[host].recall_presets(cur_items)
+        elapsed = time.perf_counter() - start
+        # the frames are only queued here, the bridges send them in parallel but paced
+        send_time = max(
+            [bridges[host].send_time for host in host_items], default=0.0
+        )
+        LOGGER.debug(
+            "%s: %d requests, %d frames queued in %.4fs, sent in about %.1fs",
+            service_call.service,
+            len(items),
+            frames,
+            elapsed,
+            send_time,
+        )
+        hass.bus.async_fire(
+            EVENT_BULK_COMPLETE,
+            {
+                "service": service_call.service,
+                CONF_HOST: list(host_items),
+                "requests": len(items),
+                "frames": frames,
+                "elapsed": elapsed,
+                "send_time": send_time,
+            },
+        )
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_SET_LEVELS, async_bulk_service, schema=SET_LEVELS_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_RECALL_PRESETS,
+        async_bulk_service,
+        schema=RECALL_PRESETS_SCHEMA,
+    )
@@ -0,0 +1,110 @@
+"""Storage for the area, preset and template tables of the Dynalite bridges."""
+
+import hashlib
+import json
+from typing import Any, Dict, Optional, Tuple
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    CONF_AREA,
+    CONF_HASH,
+    CONF_HOST,
+    CONF_PRESET,
+    CONF_TEMPLATE,
+    DATA_TABLE_STORES,
+    DOMAIN,
+    LOGGER,
+    STORAGE_VERSION,
+)
+
+# The bulky parts of the bridge config that are kept out of the config entry
+TABLE_KEYS = [CONF_AREA, CONF_PRESET, CONF_TEMPLATE]
+
+
+def split_config(config: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Split a bridge config into the entry data and the tables to store separately."""
+    entry_data = {key: value for key, value in config.items() if key not in TABLE_KEYS}
+    tables = {key: config[key] for key in TABLE_KEYS if key in config}
+    entry_data[CONF_HASH] = tables_hash(tables)
+    return entry_data, tables
+
+
+def tables_hash(tables: Dict[str, Any]) -> str:
+    """Return a hash of the content of the tables."""
+    return hashlib.sha256(json.dumps(tables, sort_keys=True).encode()).hexdigest()
+
+
+class TableStore:
+    """The stored tables of one bridge, read from disk only once."""
+
+    def __init__(self, hass: HomeAssistant, host: str) -> None:
+        """Initialize the store."""
+        self.host = host
+        self.tables: Optional[Dict[str, Any]] = None
+        self.hash: Optional[str] = None
+        self._loaded = False
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{host}")
+
+    def _set_tables(self, tables: Optional[Dict[str, Any]]) -> None:
+        """Keep the tables and their hash."""
+        self.tables = tables
+        self.hash = None if tables is None else tables_hash(tables)
+        self._loaded = True
+
+    async def async_load(self) -> Optional[Dict[str, Any]]:
+        """Return the tables, None if missing or unreadable."""
+        if not self._loaded:
+            try:
+                tables = await self._store.async_load()
+            except HomeAssistantError as err:
+                LOGGER.error(
+                    "Could not read the stored areas for host %s (%s)", self.host, err
+                )
+                tables = None
+            self._set_tables(tables)
+        return self.tables
+
+    async def async_save(self, tables: Dict[str, Any]) -> None:
+        """Save the tables."""
+        LOGGER.debug("Saving tables for host %s", self.host)
+        await self._store.async_save(tables)
+        self._set_tables(tables)
+
+    async def async_remove(self) -> None:
+        """Remove the stored tables."""
+        await self._store.async_remove()
+        self._set_tables(None)
+
+
+def table_store(hass: HomeAssistant, host: str) -> TableStore:
+    """Return the table store of the bridge on host, there is one per host."""
+    stores = hass.data.setdefault(DATA_TABLE_STORES, {})
+    if host not in stores:
+        stores[host] = TableStore(hass, host)
+    return stores[host]
+
+
+async def async_load_config(
+    hass: HomeAssistant, config: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Return the full bridge config, loading the tables from storage if needed."""
+    if CONF_HASH not in config:
+        # already a full config, e.g. straight from YAML
+        return config
+    host = config[CONF_HOST]
+    store = table_store(hass, host)
+    tables = await store.async_load()
+    if tables is None:
+        LOGGER.error(
+            "No stored areas for host %s, they will be imported from YAML on restart",
+            host,
+        )
+        tables = {}
+    elif store.hash != config[CONF_HASH]:
+        LOGGER.warning("Stored areas for host %s do not match the config entry", host)
+    full_config = {key: value for key, value in config.items() if key != CONF_HASH}
+    full_config.update(tables)
+    return full_config
@@ -0,0 +1,207 @@
+"""Dynet connection that reads and decodes frames in a worker thread."""
+
+import asyncio
+import socket
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from dynalite_devices_lib.const import (
+    CONF_ACTION,
+    CONF_AREA,
+    CONF_CHANNEL,
+    CONNECTION_RETRY_DELAY,
+    EVENT_CHANNEL,
+    EVENT_CONNECTED,
+    EVENT_DISCONNECTED,
+    EVENT_PRESET,
+)
+from dynalite_devices_lib.dynet import DynetPacket
+from dynalite_devices_lib.event import DynetEvent
+
+from .connection import DynetConnection
+from .const import DEFAULT_WORKER_BATCH, LOGGER
+
+READ_SIZE = 4096
+
+
+class SocketWriter:
+    """Minimal stream writer so Dynalite.write can send on the worker's socket."""
+
+    def __init__(self, sock: socket.socket) -> None:
+        """Initialize the writer."""
+        self._sock = sock
+
+    def write(self, msg: bytearray) -> None:
+        """Send a frame, a Dynet frame is small enough to not block the loop."""
+        try:
+            self._sock.sendall(msg)
+        except OSError as err:
+            LOGGER.warning("Could not write to Dynet (%s)", err)
+
+
+class DynetWorker(DynetConnection):
+    """Dynalite connection with socket reads and frame decoding off the event loop.
+
+    Decoded events are collapsed to the latest state per area/channel and handed
+    to the event loop in batches, at most every batch_interval seconds. Events that
+    pass event_filter (called in the worker thread, None for none) are all passed to
+    event_func first, before collapsing.
+    """
+
+    def __init__(
+        self,
+        broadcast_func: Callable[[DynetEvent], None],
+        event_func: Optional[Callable[[DynetEvent], None]] = None,
+        batch_interval: float = DEFAULT_WORKER_BATCH,
+    ) -> None:
+        """Initialize the worker."""
+        super().__init__(broadcast_func=broadcast_func)
+        self._event_func = event_func
+        self._stream: List[DynetEvent] = []
+        self.event_filter: Optional[Callable[[DynetEvent], bool]] = None
+        self._batch_interval = batch_interval
+        self._sock: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pending: Dict[Tuple[Any, ...], DynetEvent] = {}
+        # the worker swaps the writer on reconnect while the loop writes
+        self._writer_lock = threading.Lock()
+
+    def _open_socket(self, host: str, port: int) -> bool:
+        """Open the socket to Dynet, blocking."""
+        try:
+            sock = socket.create_connection((host, port), timeout=10)
+        except OSError as err:
+            LOGGER.warning("Could not connect to Dynet (%s)", err)
+            return False
+        sock.settimeout(self._batch_interval)
+        with self._writer_lock:
+            self._sock = sock
+            self._writer = SocketWriter(sock)
+        return True
+
+    async def connect(self, host: str, port: int) -> bool:
+        """Connect to Dynet and start the worker thread."""
+        LOGGER.debug("Connecting to Dynet on %s:%s with a worker thread", host, port)
+        self._loop = asyncio.get_running_loop()
+        self._resetting = False
+        result = await self._loop.run_in_executor(None, self._open_socket, host, port)
+        if result and not self._resetting:
+            self._thread = threading.Thread(
+                target=self._run, args=(host, port), name="dynalite-worker", daemon=True
+            )
+            self._thread.start()
+            self.broadcast(DynetEvent(event_type=EVENT_CONNECTED))
+            self.write()  # anything queued before the connection
+        return result
+
+    def write(self, new_packet: Optional[DynetPacket] = None) -> None:
+        """Write a packet or trigger write loop, without the worker swapping the socket."""
+        with self._writer_lock:
+            super().write(new_packet)
+
+    @staticmethod
+    def _event_key(event: DynetEvent) -> Tuple[Any, ...]:
+        """Return the key of the state an event changes - later events with the same key replace it."""
+        assert event.data
+        if event.event_type == EVENT_PRESET:
+            return (EVENT_PRESET, event.data[CONF_AREA])
+        assert event.event_type == EVENT_CHANNEL
+        return (
+            EVENT_CHANNEL,
+            event.data[CONF_AREA],
+            event.data[CONF_CHANNEL],
+            event.data[CONF_ACTION],
+        )
+
+    def _decode(self, data: bytes) -> None:
+        """Decode all the complete frames in the buffer into pending events."""
+        self._in_buffer.extend(data)
+        while len(self._in_buffer) >= 8:
+            packet = self.next_packet()
+            if not packet:
+                break
+            event = self.event_from_packet(packet)
+            if event:
+                event_filter = self.event_filter
+                if event_filter and event_filter(event):
+                    self._stream.append(event)
+                key = self._event_key(event)
+                # move it to the end so the order of the last changes is kept
+                self._pending.pop(key, None)
+                self._pending[key] = event
+
+    def _flush(self) -> None:
+        """Hand the pending events to the event loop."""
+        if not self._pending:
+            return
+        events = list(self._pending.values())
+        stream = self._stream
+        self._pending = {}
+        self._stream = []
+        assert self._loop
+        self._loop.call_soon_threadsafe(self._deliver, events, stream)
+
+    def _deliver(
+        self, events: List[DynetEvent], stream: Optional[List[DynetEvent]] = None
+    ) -> None:
+        """Pass a batch of events to the listeners - runs in the event loop."""
+        if self._event_func:
+            for event in stream or []:
+                self._event_func(event)
+        for event in events:
+            self._broadcast_func(event)
+
+    def _disconnected(self) -> None:
+        """Drop the socket after a disconnect."""
+        with self._writer_lock:
+            self._writer = None
+            if self._sock:
+                self._sock.close()
+                self._sock = None
+
+    def _run(self, host: str, port: int) -> None:
+        """Read and decode until reset, reconnecting when needed - runs in the worker thread."""
+        assert self._loop
+        last_flush = time.monotonic()
+        while not self._resetting:
+            try:
+                assert self._sock
+                data = self._sock.recv(READ_SIZE)
+            except socket.timeout:
+                data = None
+            except OSError:
+                data = b""
+            if data == b"":
+                # we got disconnected or EOF
+                self._flush()
+                self._disconnected()
+                if self._resetting:
+                    break
+                self._loop.call_soon_threadsafe(
+                    self._deliver, [DynetEvent(event_type=EVENT_DISCONNECTED)]
+                )
+                while not self._resetting:
+                    time.sleep(CONNECTION_RETRY_DELAY)  # Don't overload the network
+                    if self._open_socket(host, port):
+                        self._loop.call_soon_threadsafe(
+                            self._deliver, [DynetEvent(event_type=EVENT_CONNECTED)]
+                        )
+                        self._loop.call_soon_threadsafe(self.write)
+                        break
+                continue
+            if data:
+                self._decode(data)
+            now = time.monotonic()
+            if now - last_flush >= self._batch_interval:
+                self._flush()
+                last_flush = now
+        self._disconnected()
+
+    async def async_reset(self) -> None:
+        """Stop the worker thread and close the socket."""
+        self._resetting = True
+        if self._thread:
+            assert self._loop
+            await self._loop.run_in_executor(None, self._thread.join)
+            self._thread = None
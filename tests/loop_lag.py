@@ -0,0 +1,103 @@
+"""Measure the event loop lag with and without the worker thread on a busy Dynet.
+
+A local server plays Dynet traffic at a fixed frame rate (90% channel levels,
+10% preset changes over 50 areas) and the lag of a 10 ms sleep in the event loop
+is sampled while DynaliteDevices consumes it. Run from the repo root with:
+
+    python -m tests.loop_lag [frames per second] [seconds]
+"""
+
+import asyncio
+import logging
+import statistics
+import sys
+import threading
+import time
+
+from dynalite_devices_lib.dynalite_devices import DynaliteDevices
+from dynalite_devices_lib.dynet import DynetPacket
+
+from custom_components.dynalite.connection import DynetConnection
+from custom_components.dynalite.worker import DynetWorker
+
+HOST = "127.0.0.1"
+SAMPLE = 0.01
+
+
+def dynet_frame(index):
+    """Return the frame with the given index of the played traffic."""
+    area = 1 + index % 50
+    if index % 10 == 0:
+        return DynetPacket.select_area_preset_packet(area, 1 + index % 4, 1.0)
+    level = (index % 100) / 100
+    return DynetPacket.report_channel_level_packet(area, 1 + index % 8, level, level)
+
+
+def run_server(rate, ready, port):
+    """Play Dynet traffic to every client at the given rate - runs in its own thread."""
+
+    async def play(reader, writer):
+        start = time.perf_counter()
+        index = 0
+        while True:
+            index += 1
+            writer.write(dynet_frame(index).msg)
+            delay = start + index / rate - time.perf_counter()
+            if delay > 0.002:
+                await asyncio.sleep(delay)
+            if index % 50 == 0:
+                await writer.drain()
+
+    async def main():
+        server = await asyncio.start_server(play, HOST, 0)
+        port.append(server.sockets[0].getsockname()[1])
+        ready.set()
+        await asyncio.Event().wait()
+
+    asyncio.run(main())
+
+
+async def measure(worker, port, duration):
+    """Return the loop lag samples in ms and the number of device updates."""
+    updates = []
+    devices = DynaliteDevices(
+        new_device_func=lambda device: None, update_device_func=updates.append
+    )
+    connection_class = DynetWorker if worker else DynetConnection
+    devices._dynalite = connection_class(broadcast_func=devices.handle_event)
+    devices.configure({"host": HOST, "port": port, "autodiscover": True, "active": False})
+    assert await devices.async_setup()
+    await asyncio.sleep(1)
+    lags = []
+    end = time.perf_counter() + duration
+    while time.perf_counter() < end:
+        start = time.perf_counter()
+        await asyncio.sleep(SAMPLE)
+        lags.append((time.perf_counter() - start - SAMPLE) * 1000)
+    await asyncio.wait_for(devices.async_reset(), 5)
+    return sorted(lags), len(updates)
+
+
+def main():
+    """Measure both modes against the same traffic and print the results."""
+    rate = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    duration = float(sys.argv[2]) if len(sys.argv) > 2 else 5
+    logging.disable(logging.CRITICAL)
+    ready = threading.Event()
+    port = []
+    threading.Thread(
+        target=run_server, args=(rate, ready, port), daemon=True
+    ).start()
+    ready.wait()
+    print(f"{rate} frames/s for {duration:g} s")
+    for worker in (False, True):
+        lags, updates = asyncio.run(measure(worker, port[0], duration))
+        print(
+            f"{'worker' if worker else 'loop':6}: lag mean {statistics.mean(lags):.2f} ms, "
+            f"p99 {lags[int(len(lags) * 0.99)]:.2f} ms, max {lags[-1]:.2f} ms, "
+            f"{updates} device updates"
+        )
+
+
+if __name__ == "__main__":
+    main()
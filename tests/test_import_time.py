@@ -0,0 +1,182 @@
+"""Startup time budget for the Dynalite component."""
+
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Budgets in seconds, for the component on top of what Home Assistant already loaded
+IMPORT_BUDGET = 0.02
+SETUP_BUDGET = 0.01
+SETUP_BRIDGES_BUDGET = 0.05
+SETUP_ENTRY_BUDGET = 0.25
+
+# Home Assistant has these loaded before it imports any integration
+HA_PRELOAD = (
+    "import homeassistant.core, homeassistant.config_entries, "
+    "homeassistant.helpers.config_validation"
+)
+
+
+# A YAML config with two bridges of many areas each, for a fresh interpreter
+BRIDGES_CONFIG = {
+    "dynalite": {
+        "bridges": [
+            {
+                "host": host,
+                "area": {
+                    str(area): {
+                        "name": f"Area {area}",
+                        "channel": {str(channel): {} for channel in range(1, 9)},
+                    }
+                    for area in range(1, 101)
+                },
+            }
+            for host in ("1.2.3.4", "1.2.3.5")
+        ]
+    }
+}
+
+# Validating the config is part of the setup, it builds the bridge schema
+SETUP_BRIDGES = f"""
+import asyncio, time
+from unittest.mock import MagicMock
+from custom_components.dynalite import CONFIG_SCHEMA, async_setup
+hass = MagicMock()
+hass.data = {{}}
+start = time.perf_counter()
+config = CONFIG_SCHEMA({json.dumps(BRIDGES_CONFIG)})
+assert asyncio.run(async_setup(hass, config))
+elapsed = time.perf_counter() - start
+assert hass.async_create_task.call_count == 2
+print(elapsed)
+"""
+
+
+def run_python(statement, importtime=True):
+    """Run a statement in a fresh interpreter and return stderr, -X importtime output by default, or stdout."""
+    options = ["-X", "importtime"] if importtime else []
+    result = subprocess.run(
+        [sys.executable, *options, "-c", f"{HA_PRELOAD}\n{statement}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    return result.stderr if importtime else result.stdout
+
+
+def import_times(stderr):
+    """Return the cumulative import time in seconds of every module in the output."""
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue  # the header
+        times[fields[2].strip()] = int(fields[1]) / 1e6
+    return times
+
+
+def breakdown(times, count=10):
+    """Return the slowest imports as text for the failure message."""
+    slowest = sorted(times.items(), key=lambda item: item[1], reverse=True)[:count]
+    return "\n".join(f"{seconds * 1000:8.2f}ms {name}" for name, seconds in slowest)
+
+
+def test_import_time():
+    """Test that importing the component stays within the budget."""
+    times = import_times(run_python("import custom_components.dynalite"))
+    elapsed = times["custom_components.dynalite"]
+    assert elapsed < IMPORT_BUDGET, (
+        f"import took {elapsed * 1000:.2f}ms, budget {IMPORT_BUDGET * 1000:.0f}ms\n"
+        + breakdown(times)
+    )
+
+
+def test_import_is_lazy():
+    """Test that the library and the bridge schema are not loaded by the import."""
+    run_python(
+        "import sys, custom_components.dynalite; "
+        "loaded = [name for name in sys.modules if name.startswith("
+        "('dynalite_devices_lib', 'custom_components.dynalite.bridge', "
+        "'custom_components.dynalite.schema'))]; "
+        "assert not loaded, loaded"
+    )
+
+
+def test_async_setup_time():
+    """Test that setting up the component without bridges stays within the budget."""
+    from custom_components.dynalite import async_setup
+
+    hass = MagicMock()
+    hass.data = {}
+    start = time.perf_counter()
+    assert asyncio.run(async_setup(hass, {}))
+    elapsed = time.perf_counter() - start
+    assert elapsed < SETUP_BUDGET, f"async_setup took {elapsed * 1000:.2f}ms"
+
+
+def test_async_setup_bridges_time():
+    """Test that validating and setting up a YAML config with bridges stays within the budget."""
+    elapsed = float(run_python(SETUP_BRIDGES, importtime=False))
+    assert (
+        elapsed < SETUP_BRIDGES_BUDGET
+    ), f"config validation and async_setup took {elapsed * 1000:.2f}ms"
+
+
+def test_async_setup_entry_time():
+    """Test that setting up a bridge with many areas stays within the budget."""
+    pytest.importorskip("dynalite_devices_lib")
+    from custom_components.dynalite import async_setup_entry
+    from custom_components.dynalite.const import DOMAIN
+    from custom_components.dynalite.schema import BRIDGE_SCHEMA
+    from custom_components.dynalite.store import split_config
+
+    config = BRIDGE_SCHEMA(
+        {
+            "host": "1.2.3.4",
+            "area": {
+                str(area): {
+                    "name": f"Area {area}",
+                    "channel": {str(channel): {} for channel in range(1, 9)},
+                }
+                for area in range(1, 251)
+            },
+        }
+    )
+    # as it is after the import, with the tables in storage
+    entry_data, tables = split_config(config)
+    stored = json.loads(json.dumps(tables))
+    hass = MagicMock()
+    hass.data = {DOMAIN: {}}
+    hass.services.has_service.return_value = False
+    entry = MagicMock(entry_id="test", data=entry_data)
+    load = AsyncMock(return_value=stored)
+    with patch("homeassistant.helpers.storage.Store.async_load", load), patch(
+        "homeassistant.helpers.area_registry.async_get_registry",
+        AsyncMock(),
+        create=True,
+    ), patch(
+        "homeassistant.helpers.device_registry.async_get_registry",
+        AsyncMock(),
+        create=True,
+    ), patch(
+        "dynalite_devices_lib.dynalite_devices.DynaliteDevices.async_setup",
+        AsyncMock(return_value=True),
+    ):
+        start = time.perf_counter()
+        assert asyncio.run(async_setup_entry(hass, entry))
+        elapsed = time.perf_counter() - start
+    load.assert_awaited_once()
+    assert elapsed < SETUP_ENTRY_BUDGET, f"async_setup_entry took {elapsed * 1000:.2f}ms"
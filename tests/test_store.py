@@ -0,0 +1,151 @@
+"""Tests for keeping the bridge tables out of the config entry."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+pytest.importorskip("homeassistant")
+pytest.importorskip("dynalite_devices_lib")
+
+from custom_components.dynalite import async_migrate_entry  # noqa: E402
+from custom_components.dynalite.config_flow import DynaliteFlowHandler  # noqa: E402
+from custom_components.dynalite.const import CONF_HASH, DOMAIN  # noqa: E402
+from custom_components.dynalite.store import (  # noqa: E402
+    split_config,
+    table_store,
+    tables_hash,
+)
+
+HOST = "1.2.3.4"
+CONFIG = {
+    "host": HOST,
+    "port": 12345,
+    "name": "dynalite",
+    "areacreate": "manual",
+    "area": {"1": {"name": "Office", "template": "room"}},
+    "preset": {"1": {"name": "On"}},
+    "template": {"room": {"room_on": "1"}},
+}
+
+
+def make_hass():
+    """Return a mock hass with a real data dict."""
+    hass = MagicMock()
+    hass.data = {DOMAIN: {}}
+    return hass
+
+
+@pytest.fixture
+def store_mock():
+    """Patch the HA Store used for the tables."""
+    with patch("custom_components.dynalite.store.Store") as store_class:
+        store = store_class.return_value
+        store.async_load = AsyncMock(return_value=None)
+        store.async_save = AsyncMock()
+        store.async_remove = AsyncMock()
+        yield store
+
+
+def test_split_config():
+    """Test that the tables are split off with their hash."""
+    entry_data, tables = split_config(CONFIG)
+    assert tables == {
+        "area": CONFIG["area"],
+        "preset": CONFIG["preset"],
+        "template": CONFIG["template"],
+    }
+    assert "area" not in entry_data
+    assert entry_data["host"] == HOST
+    assert entry_data[CONF_HASH] == tables_hash(tables)
+
+
+def test_store_loaded_once(store_mock):
+    """Test that there is one store per host and it is only read once."""
+    store_mock.async_load.return_value = {"area": {}}
+    hass = make_hass()
+    assert table_store(hass, HOST) is table_store(hass, HOST)
+    asyncio.run(table_store(hass, HOST).async_load())
+    asyncio.run(table_store(hass, HOST).async_load())
+    assert store_mock.async_load.await_count == 1
+    assert table_store(hass, HOST).hash == tables_hash({"area": {}})
+
+
+def test_migrate_v1(store_mock):
+    """Test that a version 1 entry is split and its tables stored."""
+    hass = make_hass()
+    entry = MagicMock(version=1, data=dict(CONFIG))
+    assert asyncio.run(async_migrate_entry(hass, entry))
+    entry_data, tables = split_config(CONFIG)
+    store_mock.async_save.assert_awaited_once_with(tables)
+    hass.config_entries.async_update_entry.assert_called_once_with(
+        entry, data=entry_data
+    )
+    assert entry.version == 2
+
+
+def test_migrate_already_split(store_mock):
+    """Test that an entry that was already split does not overwrite the stored tables."""
+    hass = make_hass()
+    entry_data, _ = split_config(CONFIG)
+    entry = MagicMock(version=1, data=entry_data)
+    assert asyncio.run(async_migrate_entry(hass, entry))
+    store_mock.async_save.assert_not_awaited()
+    hass.config_entries.async_update_entry.assert_called_once_with(entry)
+    assert entry.version == 2
+
+
+def run_import(hass):
+    """Run the YAML import flow step."""
+    flow = DynaliteFlowHandler()
+    flow.hass = hass
+    flow.flow_id = "test"
+    flow.handler = DOMAIN
+    return asyncio.run(flow.async_step_import(dict(CONFIG)))
+
+
+def make_existing_entry(hass):
+    """Add an entry for the bridge that is already split, with a loaded bridge."""
+    entry_data, _ = split_config(CONFIG)
+    entry = MagicMock(version=2, data=entry_data, entry_id="test")
+    hass.config_entries.async_entries.return_value = [entry]
+    bridge = MagicMock(async_reload_config=AsyncMock())
+    hass.data[DOMAIN][entry.entry_id] = bridge
+    return entry, bridge
+
+
+def test_import_missing_store(store_mock):
+    """Test that an import saves the tables again if the store file is missing."""
+    hass = make_hass()
+    entry, bridge = make_existing_entry(hass)
+    result = run_import(hass)
+    assert result["reason"] == "already_configured"
+    _, tables = split_config(CONFIG)
+    store_mock.async_save.assert_awaited_once_with(tables)
+    hass.config_entries.async_update_entry.assert_not_called()
+    bridge.async_reload_config.assert_awaited_once_with(entry.data)
+
+
+def test_import_unchanged(store_mock):
+    """Test that an import with matching stored tables writes nothing."""
+    _, tables = split_config(CONFIG)
+    store_mock.async_load.return_value = tables
+    hass = make_hass()
+    _, bridge = make_existing_entry(hass)
+    result = run_import(hass)
+    assert result["reason"] == "already_configured"
+    store_mock.async_save.assert_not_awaited()
+    hass.config_entries.async_update_entry.assert_not_called()
+    bridge.async_reload_config.assert_not_awaited()
+
+
+def test_import_leaves_v1_entries(store_mock):
+    """Test that an import leaves a version 1 entry to the migration."""
+    hass = make_hass()
+    entry = MagicMock(version=1, data=dict(CONFIG))
+    hass.config_entries.async_entries.return_value = [entry]
+    result = run_import(hass)
+    assert result["reason"] == "already_configured"
+    store_mock.async_load.assert_not_awaited()
+    store_mock.async_save.assert_not_awaited()
+    hass.config_entries.async_update_entry.assert_not_called()
@@ -0,0 +1,165 @@
+"""Tests for the Dynet worker thread, against a local Dynet socket."""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("dynalite_devices_lib")
+
+from dynalite_devices_lib.const import (  # noqa: E402
+    CONF_ACTION,
+    CONF_ACTION_REPORT,
+    CONF_AREA,
+    CONF_CHANNEL,
+    CONF_PRESET,
+    CONF_TRGT_LEVEL,
+    EVENT_CHANNEL,
+    EVENT_CONNECTED,
+    EVENT_DISCONNECTED,
+    EVENT_PRESET,
+)
+from dynalite_devices_lib.dynet import DynetPacket  # noqa: E402
+
+from custom_components.dynalite.worker import DynetWorker  # noqa: E402
+
+HOST = "127.0.0.1"
+# long enough for all the frames of a test to land in one batch
+BATCH = 0.3
+
+
+async def run_with_server(frames, test, handler=None):
+    """Start a local Dynet server that sends the frames, and run the test against it."""
+
+    async def send_frames(reader, writer):
+        writer.write(b"".join(packet.msg for packet in frames))
+        await writer.drain()
+        await reader.read()
+        writer.close()
+
+    server = await asyncio.start_server(handler or send_frames, HOST, 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        return await test(server, port)
+    finally:
+        server.close()
+
+
+def channel_level(area, channel, level):
+    """Return a reported channel level frame."""
+    return DynetPacket.report_channel_level_packet(area, channel, level, level)
+
+
+def test_collapse_per_area_channel():
+    """Test that a batch keeps the latest event per area and channel, in order of change."""
+    frames = [
+        DynetPacket.select_area_preset_packet(1, 1, 0),
+        channel_level(2, 1, 0.2),
+        channel_level(2, 2, 0.4),
+        DynetPacket.select_area_preset_packet(1, 4, 0),
+        channel_level(2, 1, 0.6),
+        DynetPacket.select_area_preset_packet(3, 2, 0),
+    ]
+    events = []
+
+    async def test(server, port):
+        worker = DynetWorker(broadcast_func=events.append, batch_interval=BATCH)
+        assert await worker.connect(HOST, port)
+        await asyncio.sleep(2 * BATCH)
+        await asyncio.wait_for(worker.async_reset(), 5)
+
+    asyncio.run(run_with_server(frames, test))
+    assert [event.event_type for event in events] == [
+        EVENT_CONNECTED,
+        EVENT_CHANNEL,
+        EVENT_PRESET,
+        EVENT_CHANNEL,
+        EVENT_PRESET,
+    ]
+    changes = [event.data for event in events[1:]]
+    assert [change[CONF_AREA] for change in changes] == [2, 1, 2, 3]
+    assert changes[0][CONF_CHANNEL] == 2
+    assert changes[1][CONF_PRESET] == 4
+    assert changes[2][CONF_CHANNEL] == 1
+    assert changes[2][CONF_ACTION] == CONF_ACTION_REPORT
+    latest = DynetWorker.event_from_packet(channel_level(2, 1, 0.6))
+    assert changes[2][CONF_TRGT_LEVEL] == latest.data[CONF_TRGT_LEVEL]
+    assert changes[3][CONF_PRESET] == 2
+
+
+def test_event_func_gets_every_event():
+    """Test that every event that passes the filter reaches event_func, before the collapsed batch."""
+    presets = [1, 4, 2, 4]
+    frames = [DynetPacket.select_area_preset_packet(5, preset, 0) for preset in presets]
+    frames.append(DynetPacket.select_area_preset_packet(6, 3, 0))
+    calls = []
+
+    async def test(server, port):
+        worker = DynetWorker(
+            broadcast_func=lambda event: calls.append(("broadcast", event)),
+            event_func=lambda event: calls.append(("event", event)),
+            batch_interval=BATCH,
+        )
+        worker.event_filter = lambda event: event.data[CONF_AREA] == 5
+        assert await worker.connect(HOST, port)
+        await asyncio.sleep(2 * BATCH)
+        await asyncio.wait_for(worker.async_reset(), 5)
+
+    asyncio.run(run_with_server(frames, test))
+    streamed = [event.data[CONF_PRESET] for kind, event in calls if kind == "event"]
+    assert streamed == presets
+    kinds = [kind for kind, event in calls if event.event_type == EVENT_PRESET]
+    assert kinds == ["event"] * len(presets) + ["broadcast"] * 2
+    broadcast = [
+        (event.data[CONF_AREA], event.data[CONF_PRESET])
+        for kind, event in calls
+        if kind == "broadcast" and event.event_type == EVENT_PRESET
+    ]
+    assert broadcast == [(5, 4), (6, 3)]
+
+
+def test_no_stream_without_filter():
+    """Test that nothing is kept for event_func when there is no filter."""
+    frames = [DynetPacket.select_area_preset_packet(5, 1, 0)]
+    streamed = []
+
+    async def test(server, port):
+        worker = DynetWorker(
+            broadcast_func=lambda event: None,
+            event_func=streamed.append,
+            batch_interval=BATCH,
+        )
+        assert await worker.connect(HOST, port)
+        await asyncio.sleep(2 * BATCH)
+        assert worker._stream == []
+        await asyncio.wait_for(worker.async_reset(), 5)
+
+    asyncio.run(run_with_server(frames, test))
+    assert streamed == []
+
+
+def test_reset_during_reconnect():
+    """Test that a reset stops the worker while it is trying to reconnect."""
+    events = []
+
+    async def drop(reader, writer):
+        writer.close()
+
+    async def test(server, port):
+        worker = DynetWorker(
+            broadcast_func=lambda event: events.append(event.event_type),
+            batch_interval=BATCH,
+        )
+        assert await worker.connect(HOST, port)
+        # nothing to reconnect to
+        server.close()
+        await server.wait_closed()
+        await asyncio.sleep(2 * BATCH)
+        assert EVENT_DISCONNECTED in events
+        thread = worker._thread
+        assert thread and thread.is_alive()
+        await asyncio.wait_for(worker.async_reset(), 5)
+        assert not thread.is_alive()
+        assert worker._sock is None and worker._writer is None
+
+    asyncio.run(run_with_server([], test, handler=drop))
+    assert events == [EVENT_CONNECTED, EVENT_DISCONNECTED]